@@ -3,6 +3,50 @@ import re
 import sys
 from os import getenv
 
+# Query name patterns (compiled once and shared by QUERY_DB_MAP and QUERY_ALIAS_MAP)
+_GET_LAST_VALUE_PATTERN = re.compile(r"^\bGet\s+Last\s+Value\s+for\s+\w+\b$", re.IGNORECASE)
+_CREATE_STAGE_TABLE_PATTERN = re.compile(r"^\bCreate\s+Table\s+(?:Dim|Fact)\w*Stage\b$", re.IGNORECASE)
+_GET_OLTP_RECORD_PATTERN = re.compile(r"^\bGet\s+(?:Record|Data)\s+from\s+(?!\w*Stage\b)(\w+)\b$", re.IGNORECASE)
+_FULL_LOAD_QUERY_PATTERN = re.compile(r"^V_FullLoadQuery(?:_\w+|\w*)$", re.IGNORECASE)
+_INCREMENTAL_LOAD_QUERY_PATTERN = re.compile(r"^V_IncrementalLoadQuery(?:_\w+|\w*)$", re.IGNORECASE)
+_QUERY_VARIABLE_PATTERN = re.compile(r"^V_Query(?:_\w+|\w*)$", re.IGNORECASE)
+_CREATE_STAGE_INDEX_PATTERN = re.compile(r"^\bCreate\s+Clustered\s+Index\s+on\s+(?:Dim|Fact)\w*Stage\b$", re.IGNORECASE)
+_UPDATE_IS_EXISTS_PATTERN = re.compile(r"^\bUpdate\s+IsExists\b$", re.IGNORECASE)
+_GET_STAGE_RECORD_PATTERN = re.compile(r"^\bGet\s+(?:Record|Data)\s+from\s+(?:Dim|Fact)\w*Stage\b$", re.IGNORECASE)
+_UPDATE_DW_TABLE_PATTERN = re.compile(r"^\bUpdate\s+(?:Dim|Fact)(?!\w*Stage\b)(\w+)\b$", re.IGNORECASE)
+_UPDATE_CONFIG_TABLE_PATTERN = re.compile(r"^\bUpdate\s+ConfigTable\b$", re.IGNORECASE)
+_INSERT_PACKAGE_LOG_PATTERN = re.compile(r"^\bInsert\s+PackageLog\b$", re.IGNORECASE)
+
+# Query name patterns in precedence order, each with the database its query runs against
+# ('database', 'database_stage' or None). QUERY_DB_MAP and the fused alternation below are
+# both built from this table, so a pattern added here is bucketed and classified alike
+_QUERY_NAME_DATABASES = {
+    _GET_LAST_VALUE_PATTERN: 'database',
+    _CREATE_STAGE_TABLE_PATTERN: 'database_stage',
+    _GET_OLTP_RECORD_PATTERN: None,
+    _FULL_LOAD_QUERY_PATTERN: None,
+    _INCREMENTAL_LOAD_QUERY_PATTERN: None,
+    _QUERY_VARIABLE_PATTERN: None,
+    _CREATE_STAGE_INDEX_PATTERN: 'database_stage',
+    _UPDATE_IS_EXISTS_PATTERN: 'database_stage',
+    _GET_STAGE_RECORD_PATTERN: 'database_stage',
+    _UPDATE_DW_TABLE_PATTERN: 'database',
+    _UPDATE_CONFIG_TABLE_PATTERN: 'database',
+    _INSERT_PACKAGE_LOG_PATTERN: 'database',
+}
+
+# One match classifies a query name; the named group that matched identifies the pattern
+QUERY_NAME_PATTERNS = tuple(_QUERY_NAME_DATABASES)
+_QUERY_NAME_RE = re.compile(
+    "|".join(f"(?P<q{i}>{pattern.pattern})" for i, pattern in enumerate(QUERY_NAME_PATTERNS)),
+    re.IGNORECASE
+)
+
+def match_query_pattern(query_name: str):
+    """Return the first QUERY_DB_MAP pattern matching the query name, or None."""
+    match = _QUERY_NAME_RE.match(query_name)
+    return QUERY_NAME_PATTERNS[int(match.lastgroup[1:])] if match else None
+
 class _DatabaseConfig:
     _instance = None
     _initialized = False
@@ -16,6 +60,7 @@ class _DatabaseConfig:
         if not self._initialized:
             self._database = None
             self._database_stage = None
+            self._query_db_map = None
             self._initialized = True
 
     @property
@@ -39,25 +84,20 @@ class _DatabaseConfig:
         # TODO:
         # - Remove the DB Mapping since it is already being handled by connection lookup 
         
-        return {
-            re.compile(r"^\bGet\s+Last\s+Value\s+for\s+\w+\b$", re.IGNORECASE): self._database,
-            re.compile(r"^\bCreate\s+Table\s+(?:Dim|Fact)\w*Stage\b$", re.IGNORECASE): self._database_stage,
-            re.compile(r"^\bGet\s+(?:Record|Data)\s+from\s+(?!\w*Stage\b)(\w+)\b$", re.IGNORECASE): None,
-            re.compile(r"^V_FullLoadQuery(?:_\w+|\w*)$", re.IGNORECASE): None,
-            re.compile(r"^V_IncrementalLoadQuery(?:_\w+|\w*)$", re.IGNORECASE): None,
-            re.compile(r"^V_Query(?:_\w+|\w*)$", re.IGNORECASE): None,
-            re.compile(r"^\bCreate\s+Clustered\s+Index\s+on\s+(?:Dim|Fact)\w*Stage\b$", re.IGNORECASE): self._database_stage,
-            re.compile(r"^\bUpdate\s+IsExists\b$", re.IGNORECASE): self._database_stage,
-            re.compile(r"^\bGet\s+(?:Record|Data)\s+from\s+(?:Dim|Fact)\w*Stage\b$", re.IGNORECASE): self._database_stage,
-            re.compile(r"^\bUpdate\s+(?:Dim|Fact)(?!\w*Stage\b)(\w+)\b$", re.IGNORECASE): self._database,
-            re.compile(r"^\bUpdate\s+ConfigTable\b$", re.IGNORECASE): self._database,
-            re.compile(r"^\bInsert\s+PackageLog\b$", re.IGNORECASE): self._database,
+        # Rebuilt only after the DB names are (re)loaded
+        if self._query_db_map is None:
+            databases = {'database': self._database, 'database_stage': self._database_stage}
+            self._query_db_map = {
+                pattern: databases.get(database)
+                for pattern, database in _QUERY_NAME_DATABASES.items()
             }
+        return self._query_db_map
 
     def _load_env_vars(self):
         """Load environment variables when first accessed"""
         self._database = getenv('SQL_DATABASE')
         self._database_stage = getenv('SQL_DATABASE_STAGE')
+        self._query_db_map = None
 
 def init_environment(logger=None):
     """
@@ -107,6 +147,12 @@ FRAMEWORK_CONTAINERS = [
     re.compile(r"Update.*Config.*Table.*Insert.*Log")
 ]
 
+# Dataflow processing order (matched against pipeline refId, earlier patterns run first)
+DATAFLOW_PRIORITY_PATTERNS = [
+    re.compile(r".*Extract.*Transform.*OLTP.*"),
+    re.compile(r".*Load.*Data.*")
+]
+
 # Specific patterns for each package type
 PACKAGE_TYPES = {
     'Full Load': {
@@ -128,6 +174,9 @@ PACKAGE_TYPES = {
     }
 }
 
+# Config table lookup whose presence marks a package as incremental
+CONFIG_COMPONENT_PATTERN = re.compile(r"Get.*Config.*Table")
+
 # Specific (extra) SQL Script components
 DYNAMIC_VALIDATION_RULES = {
     'FACT': [
@@ -140,8 +189,8 @@ DYNAMIC_VALIDATION_RULES = {
 # SQL patterns
 SQL_TABLE_NAME_PATTERN = re.compile(r"Table Name:\s*(\w+)")
 SQL_SECTION_DELIMITER = re.compile(r"\-\-\-+\n")
-SQL_USE_STATEMENT = r"(?i)^\s*USE\s+.*\s*;?\s*(\n|$)"
-SQL_SECTION_HEADER = r"--(.*?)(\n|$)"
+SQL_USE_STATEMENT = re.compile(r"(?i)^\s*USE\s+.*\s*;?\s*(\n|$)", re.MULTILINE)
+SQL_SECTION_HEADER = re.compile(r"--(.*?)(\n|$)")
 
 # Component patterns
 COMPONENT_PATTERNS = {
@@ -216,15 +265,18 @@ IMPORTANT: Ensure that regex patterns match exactly between QUERY_DB_MAP and QUE
 """
 # Singleton instance
 db_config = _DatabaseConfig()
-DATABASE = db_config.DATABASE
-DATABASE_STAGE = db_config.DATABASE_STAGE
-QUERY_DB_MAP = db_config.QUERY_DB_MAP
+
+def __getattr__(name):
+    """Resolve DATABASE, DATABASE_STAGE and QUERY_DB_MAP from db_config on first access, not at import."""
+    if name in ('DATABASE', 'DATABASE_STAGE', 'QUERY_DB_MAP'):
+        return getattr(db_config, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 QUERY_ALIAS_MAP = {
-    re.compile(r"^\bGet\s+Last\s+Value\s+for\s+\w+\b$", re.IGNORECASE): "Get Config Record",
-    re.compile(r"^\bCreate\s+Table\s+(?:Dim|Fact)\w*Stage\b$", re.IGNORECASE): "Stage Initialization",
+    _GET_LAST_VALUE_PATTERN: "Get Config Record",
+    _CREATE_STAGE_TABLE_PATTERN: "Stage Initialization",
     re.compile(r"^\bGet\s+(?:Record|Data)\s+[Ff]rom\s+(?!\w*Stage\b)(\w+)\b", re.IGNORECASE): "Get Record from OLTP",
-    re.compile(r"^\bCreate\s+Clustered\s+Index\s+on\s+(?:Dim|Fact)\w*Stage\b$", re.IGNORECASE): "Create Clustered Index on Stage Table",
-    re.compile(r"^\bGet\s+(?:Record|Data)\s+from\s+(?:Dim|Fact)\w*Stage\b$", re.IGNORECASE): "Get Data from Stage",
-    re.compile(r"^\bUpdate\s+(?:Dim|Fact)(?!\w*Stage\b)(\w+)\b$", re.IGNORECASE): "Update DW Table",
+    _CREATE_STAGE_INDEX_PATTERN: "Create Clustered Index on Stage Table",
+    _GET_STAGE_RECORD_PATTERN: "Get Data from Stage",
+    _UPDATE_DW_TABLE_PATTERN: "Update DW Table",
 }
\ No newline at end of file
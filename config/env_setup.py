@@ -1,6 +1,5 @@
 import os
 import logging
-from dotenv import load_dotenv
 
 def setup_environment(
     env_file: str = 'db_credentials.env',
@@ -64,7 +63,8 @@ def setup_environment(
                 logger.error(f"Failed to create {env_file}: {str(e)}")
                 return False
 
-        # Load and verify environment
+        # Load and verify environment; dotenv is only imported once a file needs parsing
+        from dotenv import load_dotenv
         if not load_dotenv(env_file):
             logger.error(f"Failed to load {env_file} - file may be corrupted")
             return False
@@ -1,12 +1,81 @@
-from typing import Dict
+import operator
+from functools import partial
+from typing import Callable, Dict, Optional
+from lxml import etree
 from config.constants import COMPONENT_PATTERNS
 from utils.helpers import validate_pattern
 
+# Compiled once and reused for every component of every pipeline
+# Exact child paths follow the SSIS layout instead of walking every descendant
+_INPUT_COLUMNS_XPATH = etree.XPath('inputs/input/inputColumns/inputColumn')
+_OUTPUT_COLUMNS_XPATH = etree.XPath('outputs/output/outputColumns/outputColumn')
+_EXTERNAL_COLUMNS_XPATH = etree.XPath('inputs/input/externalMetadataColumns/externalMetadataColumn')
+
+# Source components are analyzed first so their output columns are captured for later checks
+_SOURCE_CLASS_IDS = frozenset({'Microsoft.OLEDBSource', 'Microsoft.SSISOracleSrc'})
+
+
+def _is_non_empty_str(value) -> bool:
+    """Return True for strings with non-whitespace content."""
+    return isinstance(value, str) and bool(value.strip())
+
+
+def _build_rule_check(condition: str, expected) -> Optional[Callable]:
+    """Return a single-argument compliance check for a rule, or None if the condition is unknown."""
+    if condition == 'equals':
+        return partial(operator.eq, expected)
+    if condition == 'str_not_empty':
+        return _is_non_empty_str
+    if condition == 'is_none':
+        return partial(operator.is_, None)
+    if condition == 'regex_match':
+        return lambda value: isinstance(value, str) and expected.match(value) is not None
+    return None
+
+
+def _build_rule_message(prop: str, condition: str, expected) -> str:
+    """Return the %-style warning template for a failed rule, with the rule's own values baked in."""
+    prop = str(prop).replace('%', '%%')
+    if condition == 'equals':
+        requirement = f"should be {str(expected).replace('%', '%%')}, found %(value)s"
+    elif condition == 'str_not_empty':
+        requirement = "should be non-empty string"
+    elif condition == 'is_none':
+        requirement = "should be empty, found %(value)s"
+    else:
+        requirement = f"should match {expected.pattern.replace('%', '%%')}, found %(value)s"
+    return f"'%(component)s': Property {prop} {requirement}"
+
+
 class DataFlowAnalyzer:
     def __init__(self, logger, property_rules: Dict):
         self.logger = logger
         self.property_rules = property_rules
         self.source_columns = {}
+        # Bind each rule to its check and warning template once instead of dispatching on the
+        # condition per component; each rule set is frozen into a flat tuple iterated as-is
+        self._compiled_rules = {
+            rule_set: tuple(
+                (prop, check, _build_rule_message(prop, condition, expected))
+                for prop, (condition, expected) in rules.items()
+                if (check := _build_rule_check(condition, expected)) is not None
+            )
+            for rule_set, rules in property_rules.items()
+        }
+        # Pattern lists handed to validate_pattern, built once instead of per component
+        self._name_patterns = {
+            component_type: [pattern]
+            for component_type, pattern in COMPONENT_PATTERNS.items()
+        }
+        self._component_handlers = {
+            'Microsoft.OLEDBSource': self._analyze_oledb_source,
+            'Microsoft.SSISOracleSrc': self._analyze_oracle_source,
+            'Microsoft.OLEDBDestination': self._analyze_oledb_destination,
+        }
+
+    def reset(self) -> None:
+        """Clear per-package state; compiled rules are kept for the next review."""
+        self.source_columns = {}
 
     def analyze(self, pipeline_element) -> None:
         """Analyze data flow components in pipeline."""
@@ -15,32 +84,35 @@ class DataFlowAnalyzer:
         if pipeline_element.get("autoAdjustBufferSize") != 'true':
             self.logger.warning("'AutoAdjustBufferSize' not enabled")
 
-        components = pipeline_element.find('.//components')
+        components = pipeline_element.find('components')
         if components is None:
             self.logger.warning("No components found in pipeline")
             return
 
-        sorted_components = sorted(
-            components,
-            key=lambda c: 0
-            if (c.attrib.get('componentClassID') == 'Microsoft.OLEDBSource' or
-            c.attrib.get('componentClassID') == 'Microsoft.SSISOracleSrc') else 1
-            )
+        # Sources run first so their output columns are captured before downstream checks;
+        # the rest are deferred in document order instead of sorting the whole pipeline
+        deferred = []
+        for component in components:
+            if component.get('componentClassID') in _SOURCE_CLASS_IDS:
+                self._analyze_component(component)
+            else:
+                deferred.append(component)
 
-        for component in sorted_components:
-            component_type = component.attrib.get('componentClassID', 'unknown')
-            component_name = component.attrib.get('name', 'unnamed')
-            
-            self.logger.debug(f"Analyzing {component_type} - {component_name}")
-            
-            if component_type == 'Microsoft.OLEDBSource':
-                self._analyze_oledb_source(component, component_name)
-            elif component_type == 'Microsoft.SSISOracleSrc':
-                self._analyze_oracle_source(component, component_name)
-            elif component_type == 'Microsoft.OLEDBDestination':
-                self._analyze_oledb_destination(component, component_name)
-            elif 'MultipleHash' in component_type:
-                self._analyze_multiple_hash(component, component_name)
+        for component in deferred:
+            self._analyze_component(component)
+
+    def _analyze_component(self, component) -> None:
+        """Dispatch a component to the analyzer registered for its class ID."""
+        component_type = component.get('componentClassID', 'unknown')
+        component_name = component.get('name', 'unnamed')
+
+        self.logger.debug("Analyzing %s - %s", component_type, component_name)
+
+        handler = self._component_handlers.get(component_type)
+        if handler is None and 'MultipleHash' in component_type:
+            handler = self._analyze_multiple_hash
+        if handler is not None:
+            handler(component, component_name)
 
     def _analyze_oracle_source(self, component, component_name) -> None:
         """Validate Oracle Source components."""
@@ -48,11 +120,7 @@ class DataFlowAnalyzer:
         properties = self._extract_properties(component)
         self._check_property_compliance(properties, component_name, 'oracle_source')
 
-        # Capture output columns for downstream validation
-        self.source_columns = {
-            col.attrib['name']: col.attrib['dataType']
-            for col in component.findall('.//outputColumn')
-        }
+        self._capture_source_columns(component)
 
     def _analyze_oledb_source(self, component, component_name) -> None:
         """Validate OLEDB Source components."""
@@ -60,10 +128,14 @@ class DataFlowAnalyzer:
         properties = self._extract_properties(component)
         self._check_property_compliance(properties, component_name, 'oledb_source')
 
-        # Capture output columns for downstream validation
+        self._capture_source_columns(component)
+
+    def _capture_source_columns(self, component) -> None:
+        """Capture source output columns for downstream validation."""
+        # Keyed by casefolded name in the same pass, so downstream checks compare keys directly
         self.source_columns = {
-            col.attrib['name']: col.attrib['dataType']
-            for col in component.findall('.//outputColumn')
+            (name := col.get('name', '')).casefold(): name
+            for col in _OUTPUT_COLUMNS_XPATH(component)
         }
 
     def _analyze_oledb_destination(self, component, component_name) -> None:
@@ -82,66 +154,55 @@ class DataFlowAnalyzer:
 
     def _validate_component_name(self, component, component_type: str) -> None:
         """Validate component name against patterns."""
-        name = component.attrib.get('name', '')
-        pattern = COMPONENT_PATTERNS.get(component_type)
-        if not validate_pattern(name, [pattern], self.logger):
-            self.logger.warning(f"Invalid {component_type} name: {name}")
+        name = component.get('name', '')
+        if not validate_pattern(name, self._name_patterns[component_type], self.logger):
+            self.logger.warning("Invalid %s name: %s", component_type, name)
 
     def _extract_properties(self, component) -> Dict[str, str]:
         """Extract component properties as key-value pairs."""
-        return {
-            prop.attrib['name']: prop.text
-            for prop in component.findall('.//property')
-        }
+        # Component properties are direct children of its <properties> element;
+        # iterating that node avoids a descendant walk through inputs and outputs
+        properties = component.find('properties')
+        if properties is None:
+            return {}
+        return {prop.get('name'): prop.text for prop in properties.iterchildren('property')}
 
     def _check_property_compliance(self, properties: Dict, component_name: str, rule_set: str) -> None:
         """Validate properties against configured rules."""
-        rules = self.property_rules.get(rule_set, {})
-        for prop, (condition, *args) in rules.items():
+        for prop, check, message in self._compiled_rules.get(rule_set, ()):
             value = properties.get(prop)
-
-            if condition == 'equals':
-                if value != args[0]:
-                    self.logger.warning(
-                        f"'{component_name}': Property {prop} should be {args[0]}, found {value}"
-                    )
-            elif condition == 'str_not_empty':
-                if not (isinstance(value, str) and value.strip()):
-                    self.logger.warning(
-                        f"'{component_name}': Property {prop} should be non-empty string"
-                    )
-            elif condition == 'is_none':
-                if value is not None:
-                    self.logger.warning(
-                        f"'{component_name}': Property {prop} should be empty, found {value}"
-                    )
+            if not check(value):
+                self.logger.warning(message, {'component': component_name, 'value': value})
 
     def _check_column_mapping(self, component, component_name) -> None:
         """Validate destination column mapping."""
-        input_columns = {
-            col.attrib.get('cachedName'): col.attrib.get('cachedDataType')
-            for col in component.findall('.//inputColumn')
-        }
-        
-        mapped_columns = {
-            col.attrib['name']: col.attrib['dataType']
-            for col in component.findall('.//externalMetadataColumn')
+        external_columns = _EXTERNAL_COLUMNS_XPATH(component)
+        if not external_columns:
+            return
+
+        # Input names are only collected once there is a destination column to check
+        input_names = {
+            col.get('cachedName', '').casefold()
+            for col in _INPUT_COLUMNS_XPATH(component)
         }
-        
-        input_lower = {col.lower() for col in input_columns.keys()}
 
-        missing = {col for col in mapped_columns.keys() if col.lower() not in input_lower}
+        # Destination columns keyed by casefolded name; the keys view is subtracted directly
+        mapped_names = {(name := col.get('name', '')).casefold(): name for col in external_columns}
+        missing = {mapped_names[key] for key in mapped_names.keys() - input_names}
         if missing:
-            self.logger.warning(f"Unmapped columns detected in '{component_name}': {missing}")
+            self.logger.warning("Unmapped columns detected in '%s': %s", component_name, missing)
 
     def _check_column_selection(self, component, component_name) -> None:
         """Validate selected columns in transformation components."""
-        selected_columns = {
-            col.attrib['cachedName']: col.attrib['cachedDataType']
-            for col in component.findall('.//inputColumn')
+        if not self.source_columns:
+            return
+
+        selected_names = {
+            col.get('cachedName', '').casefold()
+            for col in _INPUT_COLUMNS_XPATH(component)
         }
-        selected_columns_lower = {col.lower() for col in selected_columns.keys()}
 
-        unselected = {col for col in self.source_columns.keys() if col.lower() not in selected_columns_lower}
+        source_columns = self.source_columns
+        unselected = {source_columns[key] for key in source_columns.keys() - selected_names}
         if unselected:
-            self.logger.warning(f"Unselected columns detected in '{component_name}': {unselected}")
\ No newline at end of file
+            self.logger.warning("Unselected columns detected in '%s': %s", component_name, unselected)
@@ -1,9 +1,27 @@
 import os, sys
+import logging
 import pyodbc
 import re
+from functools import lru_cache
 from config.constants import ENV_FILE
 from config.env_setup import setup_environment
 
+_INSERT_TABLE_PATTERN = re.compile(r'^\s*INSERT\s+INTO\s+(\w+)', re.IGNORECASE | re.MULTILINE)
+
+# Column data types scripted with a (length), (precision,scale) or (scale) suffix
+_LENGTH_TYPES = frozenset({'varchar', 'nvarchar', 'char', 'nchar', 'varbinary'})
+_PRECISION_TYPES = frozenset({'decimal', 'numeric'})
+_SCALE_TYPES = frozenset({'datetime2', 'datetimeoffset', 'time'})
+
+
+@lru_cache(maxsize=256)
+def _insert_statement_pattern(table_name: str) -> re.Pattern:
+    """Compile, once per table, the pattern matching its INSERT INTO statement."""
+    return re.compile(
+        rf'^\s*INSERT\s+INTO\s+{re.escape(table_name)}\b[^\x00]*?(?=(?:^[ \t]*INSERT\s+INTO\b|\Z|^[ \t]*END\b))',
+        re.IGNORECASE | re.MULTILINE | re.DOTALL
+        )
+
 
 class DBQueries:
     def __init__(self, logger) -> None:
@@ -30,6 +48,40 @@ class DBQueries:
         ):
             raise RuntimeError("Environment setup failed. Please check the configuration.")
 
+        # Opened on first use and reused until the review ends; reset() drops it between reviews
+        self._conn = None
+
+    def _get_connection(self):
+        """Return the review's connection, connecting with the configured credentials if needed."""
+        if self._conn is None:
+            server = os.getenv('SQL_SERVER')
+            port = os.getenv('SQL_PORT')
+            database = os.getenv('SQL_DATABASE')
+            username = os.getenv('SQL_USERNAME')
+            password = os.getenv('SQL_PASSWORD')
+
+            conn_str = (
+                f"DRIVER={{ODBC Driver 17 for SQL Server}};"
+                f"SERVER={server},{port};"
+                f"DATABASE={database};"
+                f"UID={username};"
+                f"PWD={password};"
+            )
+            self._conn = pyodbc.connect(conn_str, autocommit=True)
+        return self._conn
+
+    def close(self) -> None:
+        """Close the shared database connection, if one is open."""
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except pyodbc.Error:
+                pass
+            self._conn = None
+
+    def reset(self) -> None:
+        """Drop the previous review's connection so the next lookup connects afresh."""
+        self.close()
 
     def get_table_definition(self, table, schema='dbo') -> str:
         """
@@ -45,28 +97,19 @@ class DBQueries:
             - `CREATE TABLE` with column definitions, constraints, and filegroup info.
             - Index definitions with optional data compression and filegroup details.
         """
-        server = os.getenv('SQL_SERVER')
-        port = os.getenv('SQL_PORT')
-        database = os.getenv('SQL_DATABASE')
-        username = os.getenv('SQL_USERNAME')
-        password = os.getenv('SQL_PASSWORD')
-
-        conn_str = (
-            f"DRIVER={{ODBC Driver 17 for SQL Server}};"
-            f"SERVER={server},{port};"
-            f"DATABASE={database};"
-            f"UID={username};"
-            f"PWD={password};"
-        )
-
         table = table.removeprefix('Fill_')
+        # Naming convention checked against every clustered index of the table
+        expected_clustered_name = f"IX_Clustered{table}"
 
         try:
-            conn = pyodbc.connect(conn_str)
-            cursor = conn.cursor()
+            cursor = self._get_connection().cursor()
+
+            # Column and index metadata come back in one batch (a single round trip); the
+            # table is bound as a parameter so the statement text is the same for every table
+            cursor.execute("""
+            SET NOCOUNT ON;
+            DECLARE @object_id INT = OBJECT_ID(?);
 
-            # Get table definition
-            cursor.execute(f"""
             SELECT
                 t.name                                                                            AS TableName,
                 c.name                                                                            AS ColumnName,
@@ -106,43 +149,9 @@ class DBQueries:
                 sys.partitions p ON t.object_id = p.object_id AND i.index_id = p.index_id
                     LEFT JOIN
                     sys.filegroups fg ON i.data_space_id = fg.data_space_id
-            WHERE c.object_id = OBJECT_ID('[{schema}].[{table}]')
-            ORDER BY t.name, c.column_id, i.name
-            """)
-
-            columns = cursor.fetchall()
-
-            # Build CREATE TABLE statement
-            ddl = f"DROP TABLE IF EXISTS [{schema}].[{table}]\nGO\n"
-            ddl += f"CREATE TABLE [{schema}].[{table}] (\n"
-            for col in columns:
-                col_def = f"\t[{col.ColumnName}] {col.DataType}"
-                # Data types length/precision/scale
-                if col.DataType.lower() in ('varchar', 'nvarchar', 'char', 'nchar', 'varbinary'):
-                    col_def += f"({col.Length if col.Length != -1 else 'MAX'})"
-                elif col.DataType.lower() in ('decimal', 'numeric'):
-                    col_def += f"({col.Length},{col.Scale})"
-                elif col.DataType.lower() in ('datetime2', 'datetimeoffset', 'time'):
-                    col_def += f"({col.Scale})"
-                # NOT NULL
-                col_def += " NOT NULL" if (
-                    not col.IsNullable and not col.IsPrimaryKey) else ""
-                
-                ddl += col_def + ",\n"
+            WHERE c.object_id = @object_id
+            ORDER BY t.name, c.column_id, i.name;
 
-
-            # Find the matching FileGroupName for the primary key
-            pk_file_group = next(
-                (row[10] for row in columns if row[8] == True),
-                None
-            )
-            # Table's FileGroup
-            ddl += f"\n) ON {pk_file_group}" if pk_file_group else "\n)"
-            ddl +=f"\nGO"
-
-
-            # Get indexes
-            cursor.execute(f"""
             SELECT i.name                                                                               AS IndexName,
                 i.type_desc                                                                          AS IndexType,
                 STRING_AGG(c.name, ', ') WITHIN GROUP (ORDER BY ic.key_ordinal)                      AS KeyColumns,
@@ -166,9 +175,47 @@ class DBQueries:
                 sys.partitions p ON i.object_id = p.object_id AND i.index_id = p.index_id
                     LEFT JOIN
                 sys.filegroups fg ON i.data_space_id = fg.data_space_id
-            WHERE i.object_id = OBJECT_ID('[{schema}].[{table}]') AND i.type > 0
-            GROUP BY i.name, i.type_desc, p.data_compression_desc, c.object_id, c.column_id, fg.name
-            """)
+            WHERE i.object_id = @object_id AND i.type > 0
+            GROUP BY i.name, i.type_desc, p.data_compression_desc, c.object_id, c.column_id, fg.name;
+            """, f"[{schema}].[{table}]")
+
+            columns = cursor.fetchall()
+
+            # Build CREATE TABLE statement; pieces are collected and joined once at the end
+            ddl = [
+                f"DROP TABLE IF EXISTS [{schema}].[{table}]\nGO\n",
+                f"CREATE TABLE [{schema}].[{table}] (\n",
+            ]
+            # The primary key's filegroup is picked up from the first PK row in the same pass
+            pk_file_group = None
+            pk_found = False
+            for _, column_name, data_type, length, scale, is_nullable, _, _, is_primary_key, _, file_group in columns:
+                if is_primary_key and not pk_found:
+                    pk_file_group = file_group
+                    pk_found = True
+
+                col_def = f"\t[{column_name}] {data_type}"
+                # Data types length/precision/scale
+                data_type = data_type.lower()
+                if data_type in _LENGTH_TYPES:
+                    col_def += f"({length if length != -1 else 'MAX'})"
+                elif data_type in _PRECISION_TYPES:
+                    col_def += f"({length},{scale})"
+                elif data_type in _SCALE_TYPES:
+                    col_def += f"({scale})"
+                # NOT NULL
+                col_def += " NOT NULL" if (
+                    not is_nullable and not is_primary_key) else ""
+                
+                ddl.append(col_def + ",\n")
+
+            # Table's FileGroup
+            ddl.append(f"\n) ON {pk_file_group}" if pk_file_group else "\n)")
+            ddl.append("\nGO")
+
+
+            # Index definitions are the second result set of the batch
+            cursor.nextset()
 
             indexes = cursor.fetchall()
             if indexes:
@@ -179,18 +226,17 @@ class DBQueries:
                     if idx.IsPrimaryKey:
                         # Validate naming convention for clustered index
                         if idx.IndexType.upper() == 'CLUSTERED':
-                            expected_format = f"IX_Clustered{table}"
-                            if idx.IndexName != expected_format:
-                                self.logger.warning(f"Clustered index name '{idx.IndexName}' does not conform to expected pattern '{expected_format}'.")
+                            if idx.IndexName != expected_clustered_name:
+                                self.logger.warning("Clustered index name '%s' does not conform to expected pattern '%s'.", idx.IndexName, expected_clustered_name)
                         # Build the PRIMARY KEY constraint
-                        ddl += f"""
+                        ddl.append(f"""
                         ALTER TABLE [{schema}].[{table}]
                         ADD CONSTRAINT [{idx.IndexName}]
                         PRIMARY KEY {idx.IndexType} ({idx.KeyColumns})
                         {('WITH (DATA_COMPRESSION = ' + idx.DataCompression + ')') if idx.DataCompression else ''}
                         ON {idx.FileGroupName};
                         GO
-                        """
+                        """)
                         primary_key_added = True
                         break
     
@@ -200,28 +246,26 @@ class DBQueries:
                         continue
                     # Validate naming convention for clustered indexes
                     if idx.IndexType.upper() == 'CLUSTERED':
-                        expected_format = f"IX_Clustered{table}"
-                        if idx.IndexName != expected_format:
-                            self.logger.warning(f"Clustered index name '{idx.IndexName}' does not conform to expected pattern '{expected_format}'.")
+                        if idx.IndexName != expected_clustered_name:
+                            self.logger.warning("Clustered index name '%s' does not conform to expected pattern '%s'.", idx.IndexName, expected_clustered_name)
 
                     # Build individual CREATE INDEX statements
-                    ddl += f"""
+                    ddl.append(f"""
                     CREATE {idx.IndexType} INDEX [{idx.IndexName}]
                         ON [{schema}].[{table}] ({idx.KeyColumns})
                     {('WITH (DATA_COMPRESSION = ' + idx.DataCompression + ')') if idx.DataCompression else ''}
                     ON {idx.FileGroupName};
                     GO
-                    """
+                    """)
             else:
                 self.logger.warning(f"Skipped scripting indexes: no eligible indexes found")
 
-            return ddl
+            return ''.join(ddl)
 
         except pyodbc.Error as e:
             self.logger.error(f"Database error: {str(e)}")
-        finally:
-            if 'conn' in locals():
-                conn.close()
+            # Drop the connection so the next lookup reconnects instead of reusing a broken one
+            self.close()
 
 
     def find_insert_statement(self, sql_content: str, table_name: str) -> str:
@@ -235,12 +279,7 @@ class DBQueries:
         Returns:
             The matched INSERT statement string, or None if not found
         """
-        pattern = re.compile(
-            rf'^\s*INSERT\s+INTO\s+{re.escape(table_name)}\b[^\x00]*?(?=(?:^s*INSERT\s+INTO\s+|\Z|^s*END))',
-            re.IGNORECASE | re.MULTILINE | re.DOTALL
-            )
-        
-        match = pattern.search(sql_content)
+        match = _insert_statement_pattern(table_name).search(sql_content)
         
         if match:
             start = match.start()
@@ -251,11 +290,13 @@ class DBQueries:
             return match.group(0).strip()
         
         # If not found
-        self.logger.warning(f"INSERT INTO statement for table '{table_name}' not found in SQL script")
+        self.logger.warning("INSERT INTO statement for table '%s' not found in SQL script", table_name)
         
         # Additional debug: Show all tables that do have INSERT statements
-        all_inserts = re.findall(r'^\s*INSERT\s+INTO\s+(\w+)', sql_content, re.IGNORECASE | re.MULTILINE)
-        if all_inserts:
-            self.logger.debug(f"Tables with INSERT statements: {', '.join(set(all_inserts))}")
+        # (the whole script is only rescanned when DEBUG output is enabled)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            all_inserts = _INSERT_TABLE_PATTERN.findall(sql_content)
+            if all_inserts:
+                self.logger.debug("Tables with INSERT statements: %s", ', '.join(set(all_inserts)))
         
         return None
@@ -4,14 +4,69 @@ from datetime import datetime
 from pathlib import Path
 from config.constants import (
     XML_NAMESPACES,
-    TABLE_TYPES
+    TABLE_TYPES,
+    CONFIG_COMPONENT_PATTERN
 )
 from utils.helpers import (
     validate_pattern,
-    get_xpath,
-    table_type_by_ssis_prefix
+    table_type_by_ssis_prefix,
+    extract_delimited
 )
-import re
+
+_EXECUTABLES_TAG = f"{{{XML_NAMESPACES['DTS']}}}Executables"
+_EXECUTABLE_TAG = f"{{{XML_NAMESPACES['DTS']}}}Executable"
+_OBJECT_NAME_ATTR = f"{{{XML_NAMESPACES['DTS']}}}ObjectName"
+_EXECUTABLE_TYPE_ATTR = f"{{{XML_NAMESPACES['DTS']}}}ExecutableType"
+_REF_ID_ATTR = f"{{{XML_NAMESPACES['DTS']}}}refId"
+_VERSION_MAJOR_ATTR = f"{{{XML_NAMESPACES['DTS']}}}VersionMajor"
+_CREATION_DATE_ATTR = f"{{{XML_NAMESPACES['DTS']}}}CreationDate"
+_CREATOR_NAME_ATTR = f"{{{XML_NAMESPACES['DTS']}}}CreatorName"
+_VARIABLE_TAG = f"{{{XML_NAMESPACES['DTS']}}}Variable"
+_PARAMETER_TAG = f"{{{XML_NAMESPACES['DTS']}}}PackageParameter"
+_CONNECTION_TAG = 'connection'
+_CONNECTIONS_TAG = 'connections'
+
+# Package name patterns per table type, wrapped once in the list form validate_pattern takes
+_TABLE_NAME_PATTERNS = {
+    table_type: [config['name_pattern']]
+    for table_type, config in TABLE_TYPES.items()
+}
+
+# Large packages can exceed libxml2's default safety limits; xml:id indexing is never used.
+# Packages are only read, so indentation-only text, comments, PIs and entity expansion can be skipped.
+_DTSX_PARSER = etree.XMLParser(
+    huge_tree=True,
+    collect_ids=False,
+    remove_blank_text=True,
+    remove_comments=True,
+    remove_pis=True,
+    resolve_entities=False,
+    no_network=True
+)
+
+
+def _format_creation_date(value: str) -> str:
+    """Convert an SSIS 'M/D/YYYY h:mm:ss AM' timestamp to 'YYYY-MM-DD HH:MM:SS'."""
+    try:
+        date_part, time_part, meridiem = value.split(' ')
+        month, day, year = date_part.split('/')
+        hour, minute, second = time_part.split(':')
+        meridiem = meridiem.upper()
+        fields = (month, day, hour, minute, second)
+        # isascii keeps other scripts' digits, which int() accepts, on the strptime path
+        if (meridiem not in ('AM', 'PM') or len(year) != 4 or not (year.isascii() and year.isdigit())
+                or not all(f.isascii() and f.isdigit() and len(f) <= 2 for f in fields)
+                or not 1 <= int(hour) <= 12):
+            raise ValueError(value)
+        # The datetime constructor still validates the calendar fields
+        parsed = datetime(
+            int(year), int(month), int(day),
+            int(hour) % 12 + (12 if meridiem == 'PM' else 0), int(minute), int(second)
+        )
+    except ValueError:
+        # Anything outside the fixed SSIS layout goes through strptime for its full parsing and errors
+        parsed = datetime.strptime(value, '%m/%d/%Y %I:%M:%S %p')
+    return parsed.strftime('%Y-%m-%d %H:%M:%S')
 
 
 class SSISProcessor:
@@ -19,15 +74,18 @@ class SSISProcessor:
         self.logger = logger
         self.namespaces = XML_NAMESPACES
         self.package_type = None
+        self.package_name = None
+        self.table_name = None
 
     def process_package(self, file_path: Path) -> Dict[str, Any]:
         """Process SSIS package file and return structured data."""
         self.logger.info("Starting package processing")
-        tree = etree.parse(file_path)
+        tree = etree.parse(file_path, _DTSX_PARSER)
         root = tree.getroot()
 
-        package_name = get_xpath(root, '@DTS:ObjectName', self.namespaces)
-        self.package_type = table_type_by_ssis_prefix(package_name, self.logger)
+        self.package_name = root.get(_OBJECT_NAME_ATTR)
+        self.table_name = self.package_name.removeprefix("Fill_")
+        self.package_type = table_type_by_ssis_prefix(self.package_name, self.logger)
 
         return {
             'metadata': self._extract_package_metadata(root),
@@ -39,18 +97,17 @@ class SSISProcessor:
     def _extract_package_metadata(self, root) -> Dict[str, str]:
         """Extract core package metadata."""
         metadata = {
-            'name': get_xpath(root, '@DTS:ObjectName', self.namespaces),
-            'table_name': get_xpath(root, '@DTS:ObjectName', self.namespaces).removeprefix("Fill_"),
-            'version': get_xpath(root, '@DTS:VersionMajor', self.namespaces),
-            'creation_date': datetime.strptime(get_xpath(root, '@DTS:CreationDate', self.namespaces), '%m/%d/%Y %I:%M:%S %p').strftime('%Y-%m-%d %H:%M:%S'),
-            'creator_name': get_xpath(root, '@DTS:CreatorName', self.namespaces).split("\\")[-1]
+            'name': self.package_name,
+            'table_name': self.table_name,
+            'version': root.get(_VERSION_MAJOR_ATTR),
+            'creation_date': _format_creation_date(root.get(_CREATION_DATE_ATTR)),
+            'creator_name': root.get(_CREATOR_NAME_ATTR).split("\\")[-1]
         }
 
         self.logger.info("Validating package name")
-        pattern = TABLE_TYPES[self.package_type]['name_pattern']
         validate_pattern(
             metadata['name'],
-            [re.compile(pattern)],
+            _TABLE_NAME_PATTERNS[self.package_type],
             self.logger)
         return metadata
 
@@ -58,64 +115,66 @@ class SSISProcessor:
         """Analyze package structure and components."""
         structure = {
             'containers': [],
+            'pipelines': [],
             'components': {},
-            'variables': self._find_variables(root),
-            'parameters': self._find_parameters(root),
-            'connections': self._find_connections(root)
+            'variables': [],
+            'parameters': [],
+            'connections': {},
+            'config_component': None
         }
+        self._collect_package_objects(root, structure)
 
-        executables = root.find('.//DTS:Executables', self.namespaces)
-        for elem in executables.findall('.//DTS:Executable', self.namespaces):
-            elem_path = elem.getroottree().getelementpath(elem)
-            elem_type = get_xpath(elem, '@DTS:ExecutableType', self.namespaces)
-            elem_name = get_xpath(elem, '@DTS:ObjectName', self.namespaces)
+        # The package-level <DTS:Executables> is a direct child of the root; iter() then
+        # visits every nested executable once, in document order
+        executables = root.find(_EXECUTABLES_TAG)
+        if executables is None:
+            return structure
 
-            structure['components'][elem_path] = {
+        for elem in executables.iter(_EXECUTABLE_TAG):
+            elem_ref_id = elem.get(_REF_ID_ATTR)
+            elem_type = elem.get(_EXECUTABLE_TYPE_ATTR)
+            elem_name = elem.get(_OBJECT_NAME_ATTR)
+
+            structure['components'][elem_ref_id] = {
                 'name': elem_name,
-                'type': elem_type
+                'type': elem_type,
+                'element': elem
             }
 
             if elem_type == "STOCK:SEQUENCE":
                 structure['containers'].append(elem_name)
+            elif elem_type == "Microsoft.Pipeline":
+                structure['pipelines'].append(elem_ref_id)
+
+            # refId of the first config table lookup, so the validator need not rescan the components;
+            # the literal 'Get' prefix rejects most names before the regex engine runs
+            if (structure['config_component'] is None and elem_name.startswith("Get")
+                    and CONFIG_COMPONENT_PATTERN.match(elem_name)):
+                structure['config_component'] = elem_ref_id
 
         return structure
 
-    def _find_variables(self, root) -> list:
-        """Find and return package variables."""
-        try:
-            return [v.attrib for v in root.xpath('.//DTS:Variable', namespaces=self.namespaces)]
-        except AttributeError:
-            return []
-
-    def _find_parameters(self, root) -> list:
-        """Find and return package parameters."""
-        try:
-            return [p.attrib for p in root.xpath('.//DTS:PackageParameter', namespaces=self.namespaces)]
-        except AttributeError:
-            return []
-
-    def _find_connections(self, root) -> dict:
-        """Find and return package connections."""
-        try:
-            connections = root.xpath('.//connections/connection', namespaces=self.namespaces)
-            result = {}
-
-            for conn in connections:
-                conn_id_raw = conn.get("connectionManagerID", "")
-                conn_ref_raw = conn.get("connectionManagerRefId", "")
+    def _collect_package_objects(self, root, structure: Dict[str, Any]) -> None:
+        """Collect variables, parameters and connections in a single walk of the package."""
+        variables = structure['variables']
+        parameters = structure['parameters']
+        connections = structure['connections']
+
+        for elem in root.iter(_VARIABLE_TAG, _PARAMETER_TAG, _CONNECTION_TAG):
+            tag = elem.tag
+            if tag == _VARIABLE_TAG:
+                variables.append(elem.attrib)
+            elif tag == _PARAMETER_TAG:
+                parameters.append(elem.attrib)
+            elif elem.getparent().tag == _CONNECTIONS_TAG:
+                conn_id_raw = elem.get("connectionManagerID", "")
+                conn_ref_raw = elem.get("connectionManagerRefId", "")
 
                 # Extract connection ID
-                id_match = re.search(r"\{(.+?)\}", conn_id_raw)
-                conn_id = id_match.group(1) if id_match else None
+                conn_id = extract_delimited(conn_id_raw, '{', '}')
 
                 # Extract connection name
-                ref_match = re.search(r"\[(.+?)\]", conn_ref_raw)
-                conn_ref = ref_match.group(1) if ref_match else None
+                conn_ref = extract_delimited(conn_ref_raw, '[', ']')
 
                 if conn_id and conn_ref:
-                    result[conn_id] = conn_ref
-
-            return result
-
-        except AttributeError:
-            return {}
+                    connections[conn_id] = conn_ref
@@ -1,13 +1,66 @@
+import io
 import os
+from functools import lru_cache
+from itertools import chain
 from typing import Dict, Optional
-from utils.helpers import get_xpath, beautify_sql_query, resolve_connection_id
+from lxml import etree
+from utils.helpers import beautify_sql_query, resolve_connection_id
 from config.constants import (
     XML_NAMESPACES,
     QUERY_ALIAS_MAP,
-    db_config
+    db_config,
+    match_query_pattern
 )
 from core.db_queries import DBQueries
 
+# Evaluates straight to a bool, so no node list is built to know a pipeline is expression-driven
+_HAS_PROPERTY_EXPRESSION_XPATH = etree.XPath('boolean(.//DTS:PropertyExpression)', namespaces=XML_NAMESPACES)
+
+# Execute SQL Task payload element and the attributes read from it
+_SQL_TASK_DATA_TAG = f"{{{XML_NAMESPACES['SQLTask']}}}SqlTaskData"
+_SQL_STATEMENT_SOURCE_ATTR = f"{{{XML_NAMESPACES['SQLTask']}}}SqlStatementSource"
+_SQL_TASK_CONNECTION_ATTR = f"{{{XML_NAMESPACES['SQLTask']}}}Connection"
+
+# Compiled once and reused for every data flow pipeline
+_COMPONENTS_XPATH = etree.XPath('.//component')
+
+# Rule written above every section of the generated SQL file
+_SECTION_SEPARATOR = "\n---------------------------------------------------------------------------\n"
+
+
+@lru_cache(maxsize=1024)
+def _query_name_pattern(query_name: str):
+    """Memoized match_query_pattern; the standard query names repeat across packages."""
+    return match_query_pattern(query_name)
+
+
+def _scan_sql_source(component):
+    """Return the first SqlCommand property, AccessMode value and connectionManagerID of a component."""
+    # One descendant walk replaces three separate XPath scans; it stops once all three are found
+    sql_command = access_mode_property = connection_id = None
+    for node in component.iterdescendants('property', 'connection'):
+        if node.tag == 'property':
+            property_name = node.get('name')
+            if property_name == 'SqlCommand' and sql_command is None:
+                sql_command = node
+            elif property_name == 'AccessMode' and access_mode_property is None:
+                access_mode_property = node
+        elif connection_id is None:
+            connection_id = node.get('connectionManagerID')
+        if sql_command is not None and access_mode_property is not None and connection_id is not None:
+            break
+    access_mode = access_mode_property.text if access_mode_property is not None else None
+    return sql_command, access_mode, connection_id
+
+
+def _write_section(write, title: str, query: str, use_statement: str = "", end: str = "\n\n") -> None:
+    """Write one titled section of the generated SQL file, with the query beautified."""
+    write(_SECTION_SEPARATOR)
+    write(f"-- {title}\n")
+    write(use_statement)
+    write(beautify_sql_query(query))
+    write(end)
+
 
 class SQLFileBuilder:
     def __init__(self, logger, db_queries: Optional[DBQueries] = None) -> None:
@@ -18,7 +71,15 @@ class SQLFileBuilder:
         self.db_queries = db_queries or DBQueries(self.logger)
         self.datawarehouse = db_config.DATABASE
         self.insert_null_script_path = None
-        self.sql_queries = []
+        # Query name -> extracted query, stored already trimmed; generate_sql_file does not strip them again
+        self.sql_queries = {}
+        # (path, mtime_ns, size, content) of the last insert-null script read
+        self._insert_null_script = None
+
+    def reset(self) -> None:
+        """Clear per-package state so the builder can be reused for the next review."""
+        self.insert_null_script_path = None
+        self.sql_queries = {}
 
     def sql_query_extractor(self, package_data: Dict):
         """
@@ -29,91 +90,89 @@ class SQLFileBuilder:
                                  including 'structure', 'tree', and 'type'.
         """
         components = package_data['structure'].get('components', {})
+        handlers = {
+            'Microsoft.ExecuteSQLTask': self._extract_from_execute_sql_task,
+            'Microsoft.Pipeline': self._extract_from_pipeline,
+        }
+
+        for value in components.values():
+            handler = handlers.get(value.get('type'))
+            if handler:
+                handler(value['element'], value, package_data)
+
+    def _extract_from_pipeline(self, element, value: Dict, package_data: Dict):
+        """Extract SQL queries from a Data Flow Task component."""
+        pipeline_type = package_data.get('type')
+        if pipeline_type == 'FACT':
+            if self._has_property_expression(element):
+                self._extract_from_variable_expressions(package_data)
+            else:
+                self._extract_from_sql_command(package_data, element, is_fact=True)
+        elif pipeline_type == 'DIM':
+            self._extract_from_sql_command(package_data, element, is_fact=False)
 
-        for key, value in components.items():
-            component_type = value.get('type')
-            if component_type == 'Microsoft.ExecuteSQLTask':
-                self._extract_from_execute_sql_task(key, value, package_data)
-
-            elif component_type == 'Microsoft.Pipeline':
-                pipeline_type = package_data.get('type')
-                if pipeline_type == 'FACT':
-                    if self._has_property_expression(package_data, key):
-                        self._extract_from_variable_expressions(package_data, key)
-                    else:
-                        self._extract_from_sql_command(package_data, key, is_fact=True)
-                elif pipeline_type == 'DIM':
-                    self._extract_from_sql_command(package_data, key, is_fact=False)
-
-    def _has_property_expression(self, package_data: Dict, key: str) -> bool:
+    def _has_property_expression(self, element) -> bool:
         """Check if the component contains a PropertyExpression."""
-        element = package_data['tree'].find(key)
-        return element.find('.//DTS:PropertyExpression', namespaces=self.namespaces) is not None
+        return _HAS_PROPERTY_EXPRESSION_XPATH(element)
 
-    def _extract_from_execute_sql_task(self, key: str, value: Dict, package_data: Dict):
+    def _extract_from_execute_sql_task(self, element, value: Dict, package_data: Dict):
         """Extract SQL query from an ExecuteSQLTask component."""
         name = value.get('name')
         connections_map = package_data['structure'].get('connections', {})
         try:
-            sql_query = get_xpath(
-                package_data['tree'].find(key),
-                './/SQLTask:SqlTaskData/@SQLTask:SqlStatementSource',
-                self.namespaces
-            )
-            # Find DB Name
-            connection_id = get_xpath(
-                package_data['tree'].find(key),
-                './/SQLTask:SqlTaskData/@SQLTask:Connection',
-                self.namespaces
-            )
+            # Both attributes come from the same SqlTaskData walk instead of one XPath scan each
+            sql_query = connection_id = None
+            for task_data in element.iterdescendants(_SQL_TASK_DATA_TAG):
+                if sql_query is None:
+                    sql_query = task_data.get(_SQL_STATEMENT_SOURCE_ATTR)
+                # Find DB Name
+                if connection_id is None:
+                    connection_id = task_data.get(_SQL_TASK_CONNECTION_ATTR)
+                if sql_query is not None and connection_id is not None:
+                    break
             sql_query_db = resolve_connection_id(connection_id, connections_map, logger=self.logger)
 
-            self.sql_queries.append({name: f"USE {sql_query_db}\nGO\n" + sql_query})
+            # The USE prefix has no leading whitespace, so trimming the end trims the whole query
+            self.sql_queries[name] = (f"USE {sql_query_db}\nGO\n" + sql_query).rstrip()
         except Exception as e:
-            self.logger.error(f"Failed to extract SQL query from '{name}': {e}")
+            self.logger.error("Failed to extract SQL query from '%s': %s", name, e)
 
-    def _extract_from_variable_expressions(self, package_data: Dict, key: str):
+    def _extract_from_variable_expressions(self, package_data: Dict):
         """Extract SQL queries from variable expressions."""
         self.logger.debug("Extracting queries from variables")
         variables = package_data['structure'].get('variables', [])
         for variable in variables:
             name = variable.get('{www.microsoft.com/SqlServer/Dts}ObjectName')
             sql_query = variable.get('{www.microsoft.com/SqlServer/Dts}Expression')
-            try:
-                sql_query = sql_query.strip('"') if sql_query else ""
-            except Exception as e:
-                self.logger.error(f"Query extraction for '{name}' failed with error:\n{e}")
-                continue
+            # Attribute values are strings or None, so a missing expression is the only case to guard
+            sql_query = sql_query.strip('"').strip() if sql_query else ""
 
-            self.sql_queries.append({name: sql_query})
+            self.sql_queries[name] = sql_query
 
-    def _extract_from_sql_command(self, package_data: Dict, key: str, is_fact: bool):
+    def _extract_from_sql_command(self, package_data: Dict, element, is_fact: bool):
         """Extract SQL queries from SqlCommand property."""
         self.logger.debug("Extracting queries from SQL command property")
-        element = package_data['tree'].find(key)
         connections_map = package_data['structure'].get('connections', {})
-        for component in element.xpath('.//component'):
+        for component in _COMPONENTS_XPATH(element):
             name = component.get('name')
-            sql_element = component.xpath('.//property[@name="SqlCommand"]')
+            sql_command, access_mode, connection_id = _scan_sql_source(component)
+
+            if sql_command is None:
+                continue
 
-            if not sql_element:
+            sql_query = (sql_command.text or "").strip()
+            if access_mode not in ('1', '2'):
+                continue
+            if not sql_query:
+                self.logger.warning("'SqlCommand' exists for '%s', but it's empty. Verify the source.", name)
                 continue
 
-            sql_query = sql_element[0].text or ""
-            access_mode = component.xpath('.//property[@name="AccessMode"]')[0].text
-            connection_id = component.xpath('.//connection/@connectionManagerID')[0]
-            try:
-                sql_query = sql_query.strip()
-                if (not sql_query) and (access_mode in ('1', '2')):
-                    self.logger.warning(f"'SqlCommand' exists for '{name}', but it's empty. Verify the source.")
-                    continue
-            except Exception as e:
-                self.logger.error(f"Query extraction for '{name}' failed with error:\n{e}")
+            if connection_id is None:
+                self.logger.error("Query extraction for '%s' failed: component has no connection manager", name)
                 continue
 
-            if access_mode in ('1', '2'):
-                sql_query_db = resolve_connection_id(connection_id, connections_map, logger=self.logger)
-                self.sql_queries.append({name: f"USE {sql_query_db}\nGO\n" + sql_query})
+            sql_query_db = resolve_connection_id(connection_id, connections_map, logger=self.logger)
+            self.sql_queries[name] = f"USE {sql_query_db}\nGO\n" + sql_query
 
     def generate_sql_file(self, package_data, queries_dict, output_file_path=None, sort_order=None):
         """
@@ -131,87 +190,90 @@ class SQLFileBuilder:
         if output_file_path is None:
             output_file_path = os.path.join(os.getcwd(), f"{package_data['metadata'].get('name')}.sql")
 
-        # Validate input dictionaries
-        missing_tables = [
-            query_name
-            for query_name in queries_dict
-            if not any(pattern.match(query_name) for pattern in sort_order)
-        ]
+        # Bucket queries under every sort order pattern they match in a single pass;
+        # queries landing in no bucket are the unrecognized ones
+        buckets = {pattern: [] for pattern in sort_order}
+        missing_tables = []
+        for query_name in queries_dict:
+            matched = False
+            for pattern, bucket in buckets.items():
+                if pattern.match(query_name):
+                    bucket.append(query_name)
+                    matched = True
+            if not matched:
+                missing_tables.append(query_name)
+
         if missing_tables:
-            self.logger.warning(
-                f"Unrecognized queries: {', '.join(missing_tables)}")
+            self.logger.warning("Unrecognized queries: %s", ', '.join(missing_tables))
 
         # Prepare sorted table list based on sort_order
-        sorted_queries = [
-            query_name
-            for pattern in sort_order
-            for query_name in queries_dict if pattern.match(query_name)
-        ]
+        sorted_queries = list(chain.from_iterable(buckets.values()))
 
         include_null_record = (package_data['table_type'] == 'DIM')
 
-        sql_lines = []
+        # Fragments carry their own line breaks and are written to the file in one go at the end,
+        # so a failure part-way through still leaves no partial output behind
+        sql_buffer = io.StringIO()
+        write = sql_buffer.write
+        use_datawarehouse = f"USE {self.datawarehouse}\nGO\n"
 
         try:
             # Fetch table creation DDL
-            sql_lines.append("/*")
-            sql_lines.append(f"Table Name: {package_data['metadata'].get('table_name')}")
-            sql_lines.append(f"Creation Date: {package_data['metadata'].get('creation_date')}")
-            sql_lines.append(f"Creator Name: {package_data['metadata'].get('creator_name')}")
-            sql_lines.append("*/")
-            sql_lines.append("\n")
+            write("/*\n")
+            write(f"Table Name: {package_data['metadata'].get('table_name')}\n")
+            write(f"Creation Date: {package_data['metadata'].get('creation_date')}\n")
+            write(f"Creator Name: {package_data['metadata'].get('creator_name')}\n")
+            write("*/\n\n")
 
             self.logger.info("Fetching table creation DDL...")
             ddl_statements = self.db_queries.get_table_definition(table=package_data['metadata'].get('table_name'), schema='dbo') or ""
-            sql_lines.append("---------------------------------------------------------------------------")
-            sql_lines.append("-- Create DW Table")
-            sql_lines.append(f"USE {self.datawarehouse}\nGO")
-            sql_lines.append(beautify_sql_query(ddl_statements))
-            sql_lines.append("\n")
+            _write_section(write, "Create DW Table", ddl_statements, use_datawarehouse)
             self.logger.info("Table creation DDL insertion completed")
 
+            get_query_alias = self._get_query_alias
+            query_alias_map = self.query_alias_map
             for query_name in sorted_queries:
-                self.logger.info(f"Inserting '{query_name}' query...")
-                query_name_alias = self._get_query_alias(query_name, self.query_db_map, self.query_alias_map)
+                self.logger.info("Inserting '%s' query...", query_name)
+                query_name_alias = get_query_alias(query_name, query_alias_map)
                 # Append DDL statements and original query
-                sql_lines.append("---------------------------------------------------------------------------")
-                sql_lines.append(f"-- '{query_name_alias}'")
-                beautified_query = beautify_sql_query(queries_dict[query_name].strip())
-                sql_lines.append(beautified_query)
-                sql_lines.append("\n")
-                self.logger.info(f"'{query_name}' query insertion completed")
+                _write_section(write, f"'{query_name_alias}'", queries_dict[query_name])
+                self.logger.info("'%s' query insertion completed", query_name)
 
             # Find Null record insertion query
             if include_null_record:
-                self.logger.info(f"Checking the existence of Null record insertion query...")
-                with open(self.insert_null_script_path, 'r', encoding='utf-16') as f:
-                    insull_sql_content = f.read()
+                self.logger.info("Checking the existence of Null record insertion query...")
+                insull_sql_content = self._read_insert_null_script(self.insert_null_script_path)
                 table_name = package_data['metadata'].get('table_name')
                 insert_null_query = self.db_queries.find_insert_statement(insull_sql_content, table_name)
                 if insert_null_query:
-                    sql_lines.append("---------------------------------------------------------------------------")
-                    sql_lines.append("-- Insert Record for Null Values")
-                    sql_lines.append(f"USE {self.datawarehouse}\nGO")
-                    beautified_query = beautify_sql_query(insert_null_query)
-                    sql_lines.append(beautified_query)
-                self.logger.info(f"'Insert Record for Null Values' query insertion completed")
+                    _write_section(write, "Insert Record for Null Values", insert_null_query, use_datawarehouse, end="")
+                self.logger.info("'Insert Record for Null Values' query insertion completed")
 
             # Write to output file
             with open(output_file_path, 'w', encoding='utf-16') as sql_file:
-                sql_file.write("\n".join(sql_lines))
+                sql_file.write(sql_buffer.getvalue())
         except Exception as e:
-            self.logger.error(f"An error occured while creating the .sql file:\n{e}")
+            self.logger.error("An error occured while creating the .sql file:\n%s", e)
+
+    def _read_insert_null_script(self, path) -> str:
+        """Return the insert-null script content, decoding the file again only when it has changed."""
+        with open(path, 'r', encoding='utf-16') as f:
+            stat = os.fstat(f.fileno())
+            cached = self._insert_null_script
+            if cached and cached[:3] == (path, stat.st_mtime_ns, stat.st_size):
+                return cached[3]
+            content = f.read()
+        self._insert_null_script = (path, stat.st_mtime_ns, stat.st_size, content)
+        return content
 
-    def _get_query_alias(self, query, query_db_map, query_alias_map):
+    @staticmethod
+    def _get_query_alias(query, query_alias_map):
         """Function to get alias names for matching queries"""
-        for pattern in query_db_map:
-            if pattern.match(query):
-                # Check if the pattern exists in QUERY_ALIAS_MAP
-                if pattern in query_alias_map:
-                    return query_alias_map[pattern]
-                else:
-                    return query  # Return the original query if no alias is found
-        return None
+        pattern = _query_name_pattern(query)
+        if pattern is None:
+            return None
+        # Return the original query if no alias is found
+        return query_alias_map.get(pattern, query)
 
     # def _get_database_name(self, query, query_db_map):
     #     """Function to get the database name for a query"""
@@ -1,7 +1,26 @@
 import re
+from functools import lru_cache
 from typing import Dict
 from config.constants import PACKAGE_TYPES
 
+_RECORD_CONFIG_CONTAINER_PATTERN = re.compile(r"Get.*Record.*Config.*Table")
+
+
+@lru_cache(maxsize=16)
+def _expected_containers(package_type: str, is_incremental: bool) -> tuple:
+    """Return the (pattern, compiled) container checks for a package type and load mode."""
+    patterns = PACKAGE_TYPES[package_type]['expected_containers']
+
+    # Filter out config table check if not incremental
+    if not is_incremental:
+        patterns = [
+            pattern for pattern in patterns
+            if not _RECORD_CONFIG_CONTAINER_PATTERN.match(pattern)
+        ]
+
+    return tuple((pattern, re.compile(pattern)) for pattern in patterns)
+
+
 class PackageValidator:
     def __init__(self, logger):
         self.logger = logger
@@ -15,35 +34,25 @@ class PackageValidator:
 
     def _check_incremental(self, package_data: Dict) -> bool:
         """Check if package uses incremental loading pattern."""
-        has_config_component = any(
-            re.match(r"Get.*Config.*Table", v['name'])
-            for v in package_data['structure']['components'].values()
-        )
-        
-        if has_config_component:
+        # The processor records the first config table lookup during its executable walk
+        if package_data['structure']['config_component'] is not None:
             self.logger.info("Package uses incremental loading pattern")
             return True
         return False
 
     def _validate_package_structure(self, package_data: Dict, is_incremental: bool) -> None:
         """Validate overall package structure."""
-        expected_containers = PACKAGE_TYPES[package_data['package_type']]['expected_containers']
+        # Filtered and compiled once per (package type, incremental) pair for the whole session
+        expected_checks = _expected_containers(package_data['package_type'], is_incremental)
         containers = package_data['structure']['containers']
 
-        # Filter out config table check if not incremental
-        if not is_incremental:
-            expected_containers = [
-                pattern for pattern in expected_containers
-                if not re.match(r"Get.*Record.*Config.*Table", pattern)
-            ]
-
         missing = [
-            pattern for pattern in expected_containers
-            if not any(re.match(pattern, c) for c in containers)
+            pattern for pattern, compiled in expected_checks
+            if not any(compiled.match(c) for c in containers)
         ]
         
         if missing:
-            self.logger.warning(f"Missing required containers: {missing}")
+            self.logger.warning("Missing required containers: %s", missing)
 
         if (package_data['structure']['variables'] and not is_incremental):
             self.logger.warning("Package contains variables which are not recommended")
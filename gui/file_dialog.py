@@ -18,12 +18,12 @@ class FileDialog:
         self.gui_handler = None
         self.root = self._initialize_root()
         GitHubTheme(self.root)
-        GitHubTheme.apply_layout(self.root)
         self.package_type = "Full Load"
         self.sql_path: Optional[Path] = None
         self.ssis_path: Optional[Path] = None
         self.log_level = "WARNING"
         self.generate_sql = True
+        self._resize_pending = False
         self._create_widgets()
         self.analysis_running = False
 
@@ -265,7 +265,15 @@ class FileDialog:
 
         self._validate_paths()
 
-        # Always update and resize after toggling
+        # Always resize after toggling; rapid toggles share a single idle callback
+        if not self._resize_pending:
+            self._resize_pending = True
+            self.root.after_idle(self._fit_window)
+
+    def _fit_window(self) -> None:
+        """Pin the window to its size after the latest layout pass."""
+        self._resize_pending = False
+        # Geometry propagation can queue further idle handlers, so flush them before reading the size
         self.root.update_idletasks()
         self.root.geometry(self.root.geometry())
 
@@ -2,8 +2,8 @@
 """Main entry point for Package Auto Review application."""
 
 import os, sys
+import logging
 from typing import Optional
-import re
 from gui.file_dialog import FileDialog
 from utils.logging import configure_logging
 from core.processor import SSISProcessor
@@ -12,6 +12,17 @@ from core.dataflow_analyzer import DataFlowAnalyzer
 from core.db_queries import DBQueries
 from core.sql_file_builder import SQLFileBuilder
 from utils.file_io import load_property_rules, ensure_config_exists
+from config.constants import DATAFLOW_PRIORITY_PATTERNS
+
+
+def _dataflow_priority(item) -> int:
+    """Sort key ranking (refId, element) pipeline pairs by the configured priority patterns."""
+    ref_id = item[0]
+    for priority, pattern in enumerate(DATAFLOW_PRIORITY_PATTERNS):
+        if pattern.match(ref_id):
+            return priority
+    return len(DATAFLOW_PRIORITY_PATTERNS)
+
 
 class PackageAutoReview:
     """Main application class orchestrating all components."""
@@ -37,7 +48,7 @@ class PackageAutoReview:
             self.validator = PackageValidator(self.logger)
             
             # Load property rules for dataflow analysis
-            property_rules = load_property_rules()
+            property_rules = load_property_rules(logger=self.logger)
             self.dataflow_analyzer = DataFlowAnalyzer(self.logger, property_rules)
         except Exception as e:
             self.logger.critical("Initialization failed: %s", str(e))
@@ -70,9 +81,19 @@ class PackageAutoReview:
         finally:
             self.cleanup()
 
+    def _begin_review(self) -> None:
+        """Reset per-package state while keeping rules, compiled patterns and DB components."""
+        self.dataflow_analyzer.reset()
+        if self.db_queries:
+            self.db_queries.reset()
+        if self.sql_file_builder:
+            self.sql_file_builder.reset()
+
     def _main_workflow(self) -> None:
         """Core application workflow."""
         try:
+            self._begin_review()
+
             # Get package type first
             package_type = self.file_dialog.get_package_type()
 
@@ -86,7 +107,7 @@ class PackageAutoReview:
             # Data processing
             package_data = self.processor.process_package(ssis_path)
             package_data['package_type'] = package_type
-            self.logger.info(f"Table type: {package_data['table_type']} | Package type: {package_data['package_type']}")
+            self.logger.info("Table type: %s | Package type: %s", package_data['table_type'], package_data['package_type'])
             
             # Validation
             self.logger.info("Starting package validation...")
@@ -96,7 +117,7 @@ class PackageAutoReview:
             except Exception as e:
                 self.logger.error(f"Package validation failed: {e}")
             finally:
-                self.logger.info(f"Package validation process ended")
+                self.logger.info("Package validation process ended")
 
             # Dataflow analysis
             self.logger.info("Starting dataflow analysis...")
@@ -106,7 +127,7 @@ class PackageAutoReview:
             except Exception as e:
                 self.logger.error(f"Dataflow analysis failed: {e}")
             finally:
-                self.logger.info(f"Dataflow analysis process ended")
+                self.logger.info("Dataflow analysis process ended")
             
             if self.file_dialog.generate_sql:
                 # Build SQL file
@@ -119,7 +140,7 @@ class PackageAutoReview:
                 except Exception as e:
                     self.logger.error(f"SQL file generation failed: {e}")
                 finally:
-                    self.logger.info(f"SQL file generation process ended")
+                    self.logger.info("SQL file generation process ended")
         except Exception as e:
             self.logger.error(f"Workflow failed: {e}")
         finally:
@@ -132,27 +153,13 @@ class PackageAutoReview:
     def _analyze_dataflows(self, package_data: dict) -> None:
         """Analyze all dataflows in the package."""
         components = package_data['structure']['components']
-        pattern_stage_db = re.compile(r".*Extract.*Transform.*OLTP.*")
-        pattern_dw_db = re.compile(r".*Load.*Data.*")
-
-        pipelines = []
-        for path, component in components.items():
-            if component['type'] == 'Microsoft.Pipeline':
-                pipeline_node = package_data['tree'].find(path)
-                ref_id = pipeline_node.attrib.get('{www.microsoft.com/SqlServer/Dts}refId', '')
-                pipelines.append((ref_id, pipeline_node))
-
-        def _get_priority(item):
-            ref_id = item[0]
-            if pattern_stage_db.match(ref_id):
-                return 0
-            elif pattern_dw_db.match(ref_id):
-                return 1
-            else:
-                return 2 
-        
+        pipelines = [
+            (ref_id or '', components[ref_id]['element'])
+            for ref_id in package_data['structure']['pipelines']
+        ]
+
         # Sort pipelines by priority
-        pipelines.sort(key=_get_priority)
+        pipelines.sort(key=_dataflow_priority)
 
         for _, pipeline_node in pipelines:
             self.dataflow_analyzer.analyze(pipeline_node.find('.//pipeline'))
@@ -164,14 +171,15 @@ class PackageAutoReview:
         self.sql_file_builder.sql_query_extractor(package_data)
 
         if self.sql_file_builder.sql_queries:
-            self.logger.debug("Extracted queries:")
-            for item in self.sql_file_builder.sql_queries:
-                for name, query in item.items():
-                    self.logger.debug(f"Query {name}:\n{query}")
+            # Skip walking every extracted query when DEBUG output is disabled
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Extracted queries:")
+                for name, query in self.sql_file_builder.sql_queries.items():
+                    self.logger.debug("Query %s:\n%s", name, query)
         else:
-            self.logger.warning(f"No SQL queries were extracted")
+            self.logger.warning("No SQL queries were extracted")
 
-        queries_dict = {list(item.keys())[0]: list(item.values())[0] for item in self.sql_file_builder.sql_queries}
+        queries_dict = dict(self.sql_file_builder.sql_queries)
 
         # SQL file selection
         sql_path = self.file_dialog.get_sql_path()
@@ -191,6 +199,8 @@ class PackageAutoReview:
 
     def cleanup(self) -> None:
         """Clean up resources."""
+        if self.db_queries:
+            self.db_queries.close()
         if self.file_dialog:
             self.file_dialog.cleanup()
         self.logger.info("Application shutdown complete")
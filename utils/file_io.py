@@ -2,8 +2,10 @@ import os
 import sys
 import yaml
 import re
+import logging
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional
 from config.constants import (
     SQL_SECTION_DELIMITER,
     SQL_USE_STATEMENT,
@@ -13,6 +15,12 @@ from config.constants import (
     DEFAULT_YAML_COMMENTS
 )
 
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 def resource_path(relative_path: str) -> str:
     """Get absolute path to resource, works for dev and PyInstaller."""
     try:
@@ -21,10 +29,19 @@ def resource_path(relative_path: str) -> str:
         base_path = os.path.abspath(".")
     return os.path.join(base_path, relative_path)
 
-def load_property_rules(yaml_file: Path = RULES_FILE) -> Dict:
+def load_property_rules(yaml_file: Path = RULES_FILE, logger: Optional[logging.Logger] = None) -> Dict:
     """Load and validate property rules from YAML file."""
-    with open(yaml_file, 'r') as f:
-        rules = yaml.safe_load(f)
+    if logger is None:
+        logger = logging.getLogger(__name__)
+    cached = _load_property_rules(str(yaml_file), os.path.getmtime(yaml_file), logger)
+    # Rule entries are immutable tuples, so copying the two dict levels protects the cache
+    return {component: dict(props) for component, props in cached.items()}
+
+@lru_cache(maxsize=4)
+def _load_property_rules(yaml_file: str, mtime: float, logger: logging.Logger) -> Dict:
+    """Parse property rules; cached per file path and modification time."""
+    with open(yaml_file, 'rb') as f:
+        rules = yaml.load(f, Loader=_YamlLoader)
     
     validated_rules = {}
     for component, props in rules.items():
@@ -32,6 +49,14 @@ def load_property_rules(yaml_file: Path = RULES_FILE) -> Dict:
         for prop, config in props.items():
             condition = config['condition']
             value = config.get('value')
+            # Compile regex rules once at load time instead of on every validation
+            if condition == 'regex_match':
+                # A rule without a usable pattern is reported and skipped instead of failing startup
+                try:
+                    value = re.compile(value)
+                except (TypeError, re.error) as e:
+                    logger.warning("Skipping regex_match rule %s.%s: invalid pattern %r (%s)", component, prop, value, e)
+                    continue
             validated_rules[component][prop] = (condition, value)
     
     return validated_rules
@@ -51,7 +76,7 @@ def read_sql_file(file_path: Path) -> str:
 
 def extract_sql_sections(content: str) -> Dict[str, str]:
     """Extract SQL sections from file content."""
-    sections = re.split(SQL_SECTION_DELIMITER, content)
+    sections = SQL_SECTION_DELIMITER.split(content)
     result = {}
     
     for section in sections:
@@ -59,13 +84,13 @@ def extract_sql_sections(content: str) -> Dict[str, str]:
         if not section:
             continue
         
-        header_match = re.search(SQL_SECTION_HEADER, section)
+        header_match = SQL_SECTION_HEADER.search(section)
         if header_match:
             section_name = header_match.group(1).strip()
             query = section[len(header_match.group(0)):].strip()
 
             # Remove the USE statements
-            query_cleaned = re.sub(SQL_USE_STATEMENT, '', query, flags=re.MULTILINE)
+            query_cleaned = SQL_USE_STATEMENT.sub('', query)
             result[section_name] = query_cleaned.strip()
     
     return result
\ No newline at end of file
@@ -1,6 +1,7 @@
 import os
 import re
 import logging
+from functools import lru_cache
 from typing import Pattern, List
 from itertools import islice
 import sqlparse
@@ -9,14 +10,22 @@ from config.constants import (
     COMPONENT_PATTERNS
 )
 
+# Precompiled patterns used by the SQL beautification helpers
+_TRAILING_GO_PATTERN = re.compile(r'(?i)\bGO\s*$')
+_BRACKETED_NAME_PATTERN = re.compile(r'\[([^\]]+)\]')
+_COLUMN_DEFINITION_PATTERN = re.compile(r'^(\[[^\]]+\]|`[^`]+`|"[^"]+"|\w+)\s*(.*)', flags=re.DOTALL)
+_CONSTRAINT_SPACING_PATTERN = re.compile(r'CONSTRAINT\s+')
+_COLUMN_ALIAS_PATTERN = re.compile(r'\bAS\s+\w+(?=,|$)', re.IGNORECASE)
+_ASSIGNMENT_PATTERN = re.compile(r'^\w+\s*=\s*\S+')
+
 
 def validate_pattern(input_str: str, patterns: List[Pattern], logger: logging.Logger) -> bool:
     """Validate string against list of regex patterns."""
     for pattern in patterns:
         if pattern.match(input_str):
-            logger.debug(f"Valid pattern match: {input_str}")
+            logger.debug("Valid pattern match: %s", input_str)
             return True
-    logger.warning(f"Pattern validation failed for: {input_str}")
+    logger.warning("Pattern validation failed for: %s", input_str)
     return False
 
 
@@ -47,12 +56,6 @@ def validate_component_name(name: str, component_type: str, logger: logging.Logg
     return bool(pattern.match(name))
 
 
-def get_xpath(element, xpath: str, namespaces: dict):
-    """Safe XPath value extraction with error handling."""
-    result = element.xpath(xpath, namespaces=namespaces)
-    return result[0] if result else None
-
-
 def validate_container_structure(containers: List[str], logger: logging.Logger) -> bool:
     """Validate container names against framework requirements."""
     missing = []
@@ -80,6 +83,7 @@ def table_type_by_ssis_prefix(package_name: str, logger: logging.Logger) -> str:
             "Package name must start with 'Fill_Dim' or 'Fill_Fact'")
 
 
+@lru_cache(maxsize=512)
 def beautify_sql_query(
     sql_query: str,
     reindent: bool = False,
@@ -133,7 +137,7 @@ def beautify_sql_query(
                 output.append(align_column_aliases(statement.value))
             else:
                 output.append(
-                    re.sub(r'(?i)\b' + re.escape('GO') + r'\s*$', '', statement.value.strip()) + '\nGO'
+                    _TRAILING_GO_PATTERN.sub('', statement.value.strip()) + '\nGO'
                 )
 
         output = [query.strip('\n') for query in output]
@@ -152,7 +156,7 @@ def format_create_table(sql: str) -> str:
     
     prefix = sql[:start_idx+1].rstrip()  # includes '('
     # Remove square brackets from schema and table names in the prefix
-    prefix = re.sub(r'\[([^\]]+)\]', r'\1', prefix)
+    prefix = _BRACKETED_NAME_PATTERN.sub(r'\1', prefix)
     
     suffix = sql[end_idx:].strip(' \nGO')  # includes ')' and anything after
     inner = sql[start_idx+1:end_idx]
@@ -183,7 +187,7 @@ def format_create_table(sql: str) -> str:
     max_name_len = 0
     for col in columns:
         # Handle complex column names (quoted or bracketed)
-        if match := re.match(r'^(\[[^\]]+\]|`[^`]+`|"[^"]+"|\w+)\s*(.*)', col, flags=re.DOTALL):
+        if match := _COLUMN_DEFINITION_PATTERN.match(col):
             col_name = match.group(1).strip('[]')
             rest = match.group(2).strip()
             col_data.append((col_name, rest))
@@ -198,7 +202,7 @@ def format_create_table(sql: str) -> str:
     # Reassemble the SQL statement
     # Remove extra spaces in CONSTRAINT lines
     formatted_cols = [
-        re.sub(r'CONSTRAINT\s+', 'CONSTRAINT ', line) if line.strip().startswith("CONSTRAINT") else line
+        _CONSTRAINT_SPACING_PATTERN.sub('CONSTRAINT ', line) if line.strip().startswith("CONSTRAINT") else line
         for line in formatted_cols
     ]
     
@@ -218,7 +222,7 @@ def align_column_aliases(sql: str) -> str:
         indent = line[:len(line) - len(line.lstrip())]
         stripped = line.strip()
         # Match patterns like: "column AS alias" or "expression) AS alias"
-        match = re.search(r'\bAS\s+\w+(?=,|$)', stripped, re.IGNORECASE)
+        match = _COLUMN_ALIAS_PATTERN.search(stripped)
         if match:
             # Split into expression and alias parts
             as_start = match.start()
@@ -247,7 +251,7 @@ def align_equals_signs(sql: str) -> str:
     # Find all lines with assignment patterns (column = value)
     for i, line in enumerate(lines):
         stripped = line.strip()
-        if re.match(r'^\w+\s*=\s*\S+', stripped):
+        if _ASSIGNMENT_PATTERN.match(stripped):
             # Split into left and right parts
             parts = stripped.split('=', 1)
             lhs = parts[0].strip()
@@ -267,12 +271,22 @@ def align_equals_signs(sql: str) -> str:
     return '\n'.join(lines) + "\nGO"
 
 
+def extract_delimited(text: str, opening: str, closing: str) -> str | None:
+    """Return the non-empty text between the first opening delimiter and the next closing one."""
+    start = text.find(opening)
+    if start == -1:
+        return None
+    end = text.find(closing, start + 1)
+    if end == -1:
+        return None
+    return text[start + 1:end] or None
+
+
 def resolve_connection_id(id_str: str, connections_map: dict, logger: logging.Logger) -> str | None:
     """Resolve a raw {GUID} string to its connection name using the connections_map."""
-    match = re.search(r"\{(.+?)\}", id_str)
-    clean_id = match.group(1) if match else None
+    clean_id = extract_delimited(id_str, '{', '}')
     connections_name = connections_map.get(clean_id) if clean_id else None 
 
-    logger.debug(f"Connection Name: {connections_name}")
+    logger.debug("Connection Name: %s", connections_name)
 
     return connections_name
\ No newline at end of file